@@ -1,11 +1,10 @@
 import datetime as dt
 from pathlib import Path
 
-from rich.console import Console
-from rich.table import Table
-
+from dom.logging_config import console
 from dom.templates.init import contest_template
 from dom.utils.csv_preview import (
+    analyze_csv,
     count_csv_rows,
     get_column_count,
     preview_csv,
@@ -15,22 +14,45 @@ from dom.utils.prompt import ask, ask_bool
 from dom.utils.time import format_datetime, format_duration
 from dom.utils.validators import ValidatorBuilder
 
-console = Console()
+# Parsers shared by several prompts, built once at import
+_NON_EMPTY_STRING = ValidatorBuilder.string(none_as_empty=True).strip().non_empty().build()
+_POSITIVE_INTEGER = ValidatorBuilder.integer().positive().build()
+_REQUIRED_COLUMN = ValidatorBuilder.string().strip().non_empty().build()
+_OPTIONAL_COLUMN = ValidatorBuilder.string().strip().build()
+
+# Rows scanned for the preview and the column count before prompting
+_CSV_SCAN_LIMIT = 1000
+
+
+def _prompt_column(
+    prompt: str, default: str, num_columns: int, *, optional: bool = False
+) -> int | None:
+    """Ask for a column number until a valid one is given (or skipped, if optional)."""
+    parser = _OPTIONAL_COLUMN if optional else _REQUIRED_COLUMN
+    while True:
+        column_input = ask(prompt, console=console, default=default, parser=parser)
+        if optional and not column_input:
+            return None
+        column = validate_column_index(column_input, num_columns)
+        if column is not None:
+            return column
 
 
 def initialize_contest():
+    from rich.table import Table  # noqa: PLC0415
+
     console.print("\n[bold cyan]Contest Configuration[/bold cyan]")
     console.print("Set up the parameters for your coding contest")
 
     name = ask(
         "Contest name",
         console=console,
-        parser=ValidatorBuilder.string(none_as_empty=True).strip().non_empty().build(),
+        parser=_NON_EMPTY_STRING,
     )
     shortname = ask(
         "Contest shortname",
         console=console,
-        parser=ValidatorBuilder.string(none_as_empty=True).strip().non_empty().build(),
+        parser=_NON_EMPTY_STRING,
     )
 
     default_start = (dt.datetime.now() + dt.timedelta(hours=1)).strftime("%Y-%m-%d %H:%M:%S")
@@ -58,7 +80,7 @@ def initialize_contest():
         "Penalty time (minutes)",
         console=console,
         default="20",
-        parser=ValidatorBuilder.integer().positive().build(),
+        parser=_POSITIVE_INTEGER,
     )
 
     allow_submit = ask_bool("Allow submissions?", console=console, default=True)
@@ -92,8 +114,14 @@ def initialize_contest():
     console.print("\n[bold cyan]CSV Preview[/bold cyan]")
     teams_file_path = Path(teams_path)
 
+    # Only the leading rows are scanned here so the preview appears right away;
+    # the whole file is counted once, after the column mapping is done
+    csv_info = analyze_csv(teams_file_path, delimiter, max_preview=10, limit=_CSV_SCAN_LIMIT)
+
     # Initial preview with auto-detection
-    has_header = preview_csv(teams_file_path, delimiter, max_rows=10, show_column_numbers=True)
+    has_header = preview_csv(
+        teams_file_path, delimiter, max_rows=10, show_column_numbers=True, info=csv_info
+    )
 
     # Ask user to confirm header detection
     if has_header:
@@ -106,7 +134,12 @@ def initialize_contest():
             has_header = False
             console.print("\n[bold cyan]Updated CSV Preview (no header)[/bold cyan]")
             preview_csv(
-                teams_file_path, delimiter, max_rows=10, show_column_numbers=True, has_header=False
+                teams_file_path,
+                delimiter,
+                max_rows=10,
+                show_column_numbers=True,
+                has_header=False,
+                info=csv_info,
             )
     else:
         header_exists = ask_bool(
@@ -118,11 +151,16 @@ def initialize_contest():
             has_header = True
             console.print("\n[bold cyan]Updated CSV Preview (with header)[/bold cyan]")
             preview_csv(
-                teams_file_path, delimiter, max_rows=10, show_column_numbers=True, has_header=True
+                teams_file_path,
+                delimiter,
+                max_rows=10,
+                show_column_numbers=True,
+                has_header=True,
+                info=csv_info,
             )
 
     # Get column count for validation
-    num_columns = get_column_count(teams_file_path, delimiter)
+    num_columns = get_column_count(teams_file_path, delimiter, info=csv_info)
 
     # Interactive column mapping
     console.print("\n[bold cyan]Column Mapping[/bold cyan]")
@@ -130,44 +168,11 @@ def initialize_contest():
         "Specify which columns contain team information (use column numbers from preview)"
     )
 
-    name_column = None
-    while name_column is None:
-        name_input = ask(
-            "Name column",
-            console=console,
-            default="1",
-            parser=ValidatorBuilder.string().strip().non_empty().build(),
-        )
-        name_column = validate_column_index(name_input, num_columns)
-
-    affiliation_column = None
-    while affiliation_column is None:
-        affiliation_input = ask(
-            "Affiliation column",
-            console=console,
-            default="2",
-            parser=ValidatorBuilder.string().strip().non_empty().build(),
-        )
-        affiliation_column = validate_column_index(affiliation_input, num_columns)
-
-    country_column = None
-    country_input = ask(
-        "Country column (optional, press Enter to skip)",
-        console=console,
-        default="",
-        parser=ValidatorBuilder.string().strip().build(),
+    name_column = _prompt_column("Name column", "1", num_columns)
+    affiliation_column = _prompt_column("Affiliation column", "2", num_columns)
+    country_column = _prompt_column(
+        "Country column (optional, press Enter to skip)", "", num_columns, optional=True
     )
-    if country_input:
-        country_column = validate_column_index(country_input, num_columns)
-        while country_column is None and country_input:
-            country_input = ask(
-                "Country column (optional, press Enter to skip)",
-                console=console,
-                default="",
-                parser=ValidatorBuilder.string().strip().build(),
-            )
-            if country_input:
-                country_column = validate_column_index(country_input, num_columns)
 
     # Auto-detect row range based on confirmed header status
     total_rows = count_csv_rows(teams_file_path, delimiter)
@@ -191,7 +196,7 @@ def initialize_contest():
                 "Start row (1-indexed)",
                 console=console,
                 default=str(start_row),
-                parser=ValidatorBuilder.integer().positive().build(),
+                parser=_POSITIVE_INTEGER,
             )
         )
         end_row = int(
@@ -199,7 +204,7 @@ def initialize_contest():
                 "End row (1-indexed)",
                 console=console,
                 default=str(end_row),
-                parser=ValidatorBuilder.integer().positive().build(),
+                parser=_POSITIVE_INTEGER,
             )
         )
 
@@ -0,0 +1,118 @@
+"""Numba-compiled byte scanner for counting rows and columns in large CSV files.
+
+Importing this module raises ImportError when numba (and therefore numpy) is
+not installed; callers are expected to fall back to the csv module.
+"""
+
+import mmap
+import os
+from pathlib import Path
+
+import numpy as np
+from numba import njit
+
+_NEWLINE = ord("\n")
+_CARRIAGE_RETURN = ord("\r")
+_QUOTE = ord('"')
+
+# Parser states
+_START_FIELD = 0
+_IN_FIELD = 1
+_IN_QUOTED = 2
+_QUOTE_IN_QUOTED = 3
+
+
+def scan_bytes_py(buf, delim: int, newline: int, quote: int) -> tuple[int, int]:
+    """
+    Count records and the widest record in a CSV buffer.
+
+    Follows the csv module's default dialect: a quote opens a quoted field
+    only as the first character of the field (a space before it makes the
+    quote literal), quoted fields may contain delimiters and line breaks,
+    and a doubled quote inside a quoted field is an escaped quote. Records
+    end at "\n", "\r\n" or a lone "\r". Empty lines count as records with
+    zero columns.
+
+    Args:
+        buf: Sequence of byte values (numpy uint8 array or bytes)
+        delim: Delimiter byte value
+        newline: Record terminator byte value
+        quote: Quote byte value
+
+    Returns:
+        Tuple of (line_count, max_cols)
+    """
+    line_count = 0
+    max_cols = 0
+    delims = 0
+    has_content = False
+    after_cr = False
+    state = _START_FIELD
+
+    for byte in buf:
+        if state == _IN_QUOTED:
+            if byte == quote:
+                state = _QUOTE_IN_QUOTED
+            continue
+        if state == _QUOTE_IN_QUOTED:
+            if byte == quote:
+                state = _IN_QUOTED
+                continue
+            state = _IN_FIELD
+
+        if byte == newline and after_cr:
+            # The second half of a "\r\n" terminator
+            after_cr = False
+            continue
+        after_cr = byte == _CARRIAGE_RETURN
+
+        if byte == newline or after_cr:
+            cols = delims + 1 if has_content else 0
+            max_cols = max(max_cols, cols)
+            line_count += 1
+            delims = 0
+            has_content = False
+            state = _START_FIELD
+        elif byte == delim:
+            delims += 1
+            has_content = True
+            state = _START_FIELD
+        elif byte == quote and state == _START_FIELD:
+            has_content = True
+            state = _IN_QUOTED
+        else:
+            has_content = True
+            state = _IN_FIELD
+
+    if has_content:
+        max_cols = max(max_cols, delims + 1)
+        line_count += 1
+    return line_count, max_cols
+
+
+scan_bytes = njit(cache=True, nogil=True)(scan_bytes_py)
+
+
+def scan_file(file_path: Path, delimiter: str) -> tuple[int, int]:
+    """
+    Memory-map a CSV file and scan it with the compiled kernel.
+
+    Args:
+        file_path: Path to CSV file
+        delimiter: Single-byte field delimiter
+
+    Returns:
+        Tuple of (line_count, max_cols)
+    """
+    with file_path.open("rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return 0, 0
+        with mmap.mmap(f.fileno(), size, access=mmap.ACCESS_READ) as mm:
+            buf = np.frombuffer(mm, dtype=np.uint8)
+            try:
+                line_count, max_cols = scan_bytes(buf, ord(delimiter), _NEWLINE, _QUOTE)
+            finally:
+                # The array must be released before the mapping can be closed
+                del buf
+    return int(line_count), int(max_cols)
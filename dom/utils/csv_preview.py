@@ -1,18 +1,85 @@
 """CSV preview and analysis utilities for team file import."""
 
+from __future__ import annotations
+
 import csv
+import os
+import re
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from functools import lru_cache
+from itertools import accumulate, islice
 from pathlib import Path
+from typing import TYPE_CHECKING, BinaryIO
 
-from rich.console import Console
-from rich.table import Table
+from dom.logging_config import console, get_logger
 
-from dom.logging_config import get_logger
+if TYPE_CHECKING:
+    from rich.table import Table
 
 logger = get_logger(__name__)
-console = Console()
 
+# Files at least this large are scanned with the numba kernel when available
+_NUMBA_SCAN_THRESHOLD = 16 << 20
+
+# Files at least this large are row-counted with pandas when available
+_PANDAS_COUNT_THRESHOLD = 1 << 20
+
+# Buffer size used when scanning raw bytes
+_READ_CHUNK_SIZE = 1 << 20
 
-def read_csv_rows(file_path: Path, delimiter: str, max_rows: int | None = None) -> list[list[str]]:
+# Files at least this large are line-counted by several threads
+_PARALLEL_COUNT_THRESHOLD = 64 << 20
+
+# Words that suggest the first row of a teams file is a header
+_HEADER_KEYWORDS = frozenset(
+    {
+        "id",
+        "name",
+        "team",
+        "affiliation",
+        "organization",
+        "country",
+        "university",
+        "college",
+        "school",
+        "institution",
+    }
+)
+_HEADER_TOKEN_RE = re.compile(r"[a-z]+")
+
+# Column references typed by the user, e.g. "2" or "$2"
+_COLUMN_INDEX_RE = re.compile(r"\s*\$?\s*(\d+)\s*")
+
+# Preview table limits; wider content is cut off with an ellipsis
+_MAX_PREVIEW_COLUMNS = 20
+_MAX_PREVIEW_CELL_WIDTH = 40
+
+
+@dataclass(frozen=True)
+class CsvFileInfo:
+    """
+    Result of a single pass over a CSV file.
+
+    Attributes:
+        preview_rows: First rows of the file, with cells stripped
+        total_rows: Number of rows in the file, or the row limit if the scan stopped there
+        num_columns: Maximum number of columns across the scanned rows
+        header_detected: Whether the first row appears to be a header
+        truncated: Whether the scan stopped at its row limit, so more rows may follow
+    """
+
+    preview_rows: list[list[str]]
+    total_rows: int
+    num_columns: int
+    header_detected: bool
+    truncated: bool = False
+
+
+def read_csv_rows(
+    file_path: Path, delimiter: str, max_rows: int | None = None
+) -> tuple[list[list[str]], int]:
     """
     Read rows from a CSV file.
 
@@ -22,29 +89,55 @@ def read_csv_rows(file_path: Path, delimiter: str, max_rows: int | None = None)
         max_rows: Maximum number of rows to read (None for all)
 
     Returns:
-        List of rows, where each row is a list of strings
+        Tuple of (rows, max_columns), where each row is a list of strings
+        and max_columns is the length of the widest row read
     """
     rows = []
+    max_cols = 0
     with file_path.open(newline="", encoding="utf-8") as f:
         reader = csv.reader(f, delimiter=delimiter)
         for idx, row in enumerate(reader):
             if max_rows and idx >= max_rows:
                 break
             rows.append([cell.strip() for cell in row])
-    return rows
+            max_cols = max(max_cols, len(row))
+    return rows, max_cols
 
 
-def count_csv_rows(file_path: Path, delimiter: str) -> int:
+def count_csv_rows(file_path: Path, delimiter: str, quick: bool = False) -> int:
     """
     Count total number of rows in a CSV file.
 
+    Files of 16 MiB or more are counted with the numba kernel and files
+    larger than 1 MiB with pandas' C parser when those are installed;
+    smaller files (or environments without them) use the csv module,
+    which avoids the import cost.
+
+    With quick=True rows are counted as lines by scanning the raw bytes
+    for newlines, which never tokenizes the file. Quoted fields containing
+    line breaks are then counted as several rows.
+
     Args:
         file_path: Path to CSV file
         delimiter: Field delimiter
+        quick: Count lines instead of parsing CSV records
 
     Returns:
         Total row count
     """
+    if quick:
+        return _count_lines(file_path)
+
+    size = file_path.stat().st_size
+    if size >= _NUMBA_SCAN_THRESHOLD:
+        scanned = _scan_csv_numba(file_path, delimiter)
+        if scanned is not None:
+            return scanned[0]
+    if size >= _PANDAS_COUNT_THRESHOLD:
+        count = _count_csv_rows_pandas(file_path, delimiter)
+        if count is not None:
+            return count
+
     count = 0
     with file_path.open(newline="", encoding="utf-8") as f:
         reader = csv.reader(f, delimiter=delimiter)
@@ -53,7 +146,98 @@ def count_csv_rows(file_path: Path, delimiter: str) -> int:
     return count
 
 
-def detect_header_row(file_path: Path, delimiter: str) -> bool:
+def _count_lines(file_path: Path) -> int:
+    """Count lines in a file, including a final line without a trailing newline."""
+    with file_path.open("rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size == 0:
+            return 0
+        if size >= _PARALLEL_COUNT_THRESHOLD and (os.cpu_count() or 1) > 1:
+            return _count_lines_parallel(file_path, size, f)
+
+        total = 0
+        tail = b""
+        while chunk := f.read(_READ_CHUNK_SIZE):
+            total += chunk.count(b"\n")
+            tail = chunk
+    if tail and not tail.endswith(b"\n"):
+        total += 1
+    return total
+
+
+def _count_lines_parallel(file_path: Path, size: int, f: BinaryIO) -> int:
+    """Count lines with one thread per CPU, each reading its own byte range."""
+    workers = os.cpu_count() or 1
+    step = -(-size // workers)
+
+    def count_range(start: int) -> int:
+        remaining = min(step, size - start)
+        buffer = bytearray(_READ_CHUNK_SIZE)
+        view = memoryview(buffer)
+        total = 0
+        # Each thread uses its own handle; readinto() releases the GIL while waiting on I/O
+        with file_path.open("rb") as part:
+            part.seek(start)
+            while remaining > 0:
+                n = part.readinto(view[: min(remaining, _READ_CHUNK_SIZE)])
+                if not n:
+                    break
+                total += buffer.count(b"\n", 0, n)
+                remaining -= n
+        return total
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        total = sum(executor.map(count_range, range(0, size, step)))
+
+    f.seek(-1, os.SEEK_END)
+    if f.read(1) != b"\n":
+        total += 1
+    return total
+
+
+def _scan_csv_numba(file_path: Path, delimiter: str) -> tuple[int, int] | None:
+    """Count rows and columns with the numba kernel, or return None if it is unavailable."""
+    if len(delimiter.encode()) != 1:
+        return None
+    try:
+        from dom.utils._csv_numba import scan_file  # noqa: PLC0415
+    except ImportError:
+        return None
+    return scan_file(file_path, delimiter)
+
+
+def _count_csv_rows_pandas(file_path: Path, delimiter: str) -> int | None:
+    """Count rows with pandas, returning None if pandas is unavailable or fails."""
+    try:
+        import pandas as pd  # noqa: PLC0415
+    except ImportError:
+        return None
+
+    try:
+        chunks = pd.read_csv(
+            file_path,
+            sep=delimiter,
+            chunksize=65536,
+            dtype=str,
+            header=None,
+            usecols=[0],
+            engine="c",
+            quoting=csv.QUOTE_MINIMAL,
+            skip_blank_lines=False,
+            encoding="utf-8",
+        )
+        return sum(len(chunk) for chunk in chunks)
+    except (pd.errors.ParserError, ValueError) as e:
+        # Includes EmptyDataError, which a leading blank line also raises
+        logger.debug(f"pandas could not count rows in {file_path}, falling back: {e}")
+        return None
+
+
+def detect_header_row(
+    file_path: Path | None = None,
+    delimiter: str = ",",
+    rows: list[list[str]] | None = None,
+) -> bool:
     """
     Auto-detect if the first row appears to be headers.
 
@@ -63,35 +247,118 @@ def detect_header_row(file_path: Path, delimiter: str) -> bool:
     - First row values look like field names
 
     Args:
-        file_path: Path to CSV file
+        file_path: Path to CSV file (ignored when rows is given)
         delimiter: Field delimiter
+        rows: Already parsed leading rows of the file
 
     Returns:
         True if first row appears to be headers
     """
-    rows = read_csv_rows(file_path, delimiter, max_rows=5)
+    if rows is None:
+        if file_path is None:
+            raise ValueError("Either file_path or rows must be provided")
+        # Only the first row and the presence of a second one matter
+        rows, _ = read_csv_rows(file_path, delimiter, max_rows=2)
 
     if len(rows) < 2:
         return False
 
-    first_row = rows[0]
-
     # Check if first row has common header keywords
-    header_keywords = {
-        "id",
-        "name",
-        "team",
-        "affiliation",
-        "organization",
-        "country",
-        "university",
-        "college",
-        "school",
-        "institution",
-    }
+    tokens = {token for cell in rows[0] for token in _HEADER_TOKEN_RE.findall(cell.lower())}
+    return not _HEADER_KEYWORDS.isdisjoint(tokens)
+
+
+def scan_csv(
+    file_path: Path, delimiter: str, preview: int = 10, limit: int | None = None
+) -> tuple[list[list[str]], int, int]:
+    """
+    Read a CSV file once, collecting preview rows, row count and column count.
+
+    Args:
+        file_path: Path to CSV file
+        delimiter: Field delimiter
+        preview: Number of leading rows to keep (with cells stripped)
+        limit: Stop after this many rows (None to scan the whole file)
+
+    Returns:
+        Tuple of (preview_rows, total_rows, max_columns)
+    """
+    if limit is None and file_path.stat().st_size >= _NUMBA_SCAN_THRESHOLD:
+        scanned = _scan_csv_numba(file_path, delimiter)
+        if scanned is not None:
+            # Only the preview rows need Python-level parsing
+            rows, preview_cols = (
+                read_csv_rows(file_path, delimiter, max_rows=preview) if preview > 0 else ([], 0)
+            )
+            total, cols = scanned
+            return rows, total, max(cols, preview_cols)
+
+    with file_path.open(newline="", encoding="utf-8") as f:
+        reader = islice(csv.reader(f, delimiter=delimiter), limit)
+        preview_rows = [[cell.strip() for cell in row] for row in islice(reader, preview)]
+        total = len(preview_rows)
+        cols = max(map(len, preview_rows), default=0)
+
+        # The remaining rows are only measured; chaining C-level iterators keeps
+        # the interpreter out of the per-row loop, leaving the last (index, width)
+        last = deque(enumerate(accumulate(map(len, reader), max), start=total + 1), maxlen=1)
+        if last:
+            total, rest_cols = last[0]
+            cols = max(cols, rest_cols)
+    return preview_rows, total, cols
+
+
+def analyze_csv(
+    file_path: Path, delimiter: str, max_preview: int = 10, limit: int | None = None
+) -> CsvFileInfo:
+    """
+    Analyze a CSV file in a single pass.
+
+    Keeps the first rows for previewing while counting rows and columns,
+    so callers never need to re-read the file. Results are cached per
+    file modification time and size, so repeated previews of an unchanged
+    file skip all I/O.
 
-    first_row_lower = [cell.lower() for cell in first_row]
-    return any(keyword in " ".join(first_row_lower) for keyword in header_keywords)
+    Args:
+        file_path: Path to CSV file
+        delimiter: Field delimiter
+        max_preview: Number of leading rows to keep in memory
+        limit: Stop after this many rows (None to scan the whole file)
+
+    Returns:
+        CsvFileInfo describing the file
+    """
+    stat = file_path.stat()
+    return _analyze_cached(
+        str(file_path.resolve()), stat.st_mtime_ns, stat.st_size, delimiter, max_preview, limit
+    )
+
+
+@lru_cache(maxsize=8)
+def _analyze_cached(
+    path_str: str,
+    _mtime_ns: int,
+    _size: int,
+    delimiter: str,
+    max_preview: int,
+    limit: int | None,
+) -> CsvFileInfo:
+    """Scan a file; _mtime_ns and _size only serve as cache invalidation keys."""
+    # One row past the limit tells a file of exactly limit rows from a longer one
+    preview_rows, total_rows, num_columns = scan_csv(
+        Path(path_str), delimiter, preview=max_preview, limit=None if limit is None else limit + 1
+    )
+    truncated = limit is not None and total_rows > limit
+    if truncated:
+        total_rows -= 1
+        del preview_rows[total_rows:]
+    return CsvFileInfo(
+        preview_rows=preview_rows,
+        total_rows=total_rows,
+        num_columns=num_columns,
+        header_detected=detect_header_row(rows=preview_rows),
+        truncated=truncated,
+    )
 
 
 def auto_detect_data_range(file_path: Path, delimiter: str) -> tuple[int, int]:
@@ -120,6 +387,8 @@ def preview_csv(
     max_rows: int = 10,
     show_column_numbers: bool = True,
     has_header: bool | None = None,
+    *,
+    info: CsvFileInfo | None = None,
 ) -> bool:
     """
     Display a preview of the CSV file with Rich formatting.
@@ -130,82 +399,122 @@ def preview_csv(
         max_rows: Maximum number of rows to display
         show_column_numbers: Whether to show column numbers
         has_header: Override header detection (None for auto-detect)
+        info: Result of a previous analyze_csv call (scan the first rows if None)
 
     Returns:
         Whether the file has a header row
     """
-    rows = read_csv_rows(file_path, delimiter, max_rows=max_rows)
-    total_rows = count_csv_rows(file_path, delimiter)
+    from rich.table import Table  # noqa: PLC0415
+
+    # Scanning stops early so the preview shows up without reading the whole file
+    if info is None:
+        info = analyze_csv(file_path, delimiter, max_preview=max_rows, limit=max_rows * 10)
+    rows = info.preview_rows[:max_rows]
+    total_label = f"{info.total_rows}+" if info.truncated else str(info.total_rows)
     if has_header is None:
-        has_header = detect_header_row(file_path, delimiter)
+        has_header = info.header_detected
 
-    if not rows:
+    num_columns = info.num_columns
+    # A file of blank lines has rows but nothing to show
+    if not rows or num_columns == 0:
         console.print("[yellow]Warning: CSV file is empty[/yellow]")
         return False
 
-    # Determine column count
-    num_columns = max(len(row) for row in rows) if rows else 0
+    # Cap the rendered columns so very wide files stay readable and fast to render
+    display_cols = min(num_columns, _MAX_PREVIEW_COLUMNS)
+    columns_truncated = display_cols < num_columns
+    # Shared tails for short rows and for the "more columns" marker
+    padding = ("",) * display_cols
+    marker = ("…",) if columns_truncated else ()
+    caption = f"Showing {len(rows)} of {total_label} rows"
+    if columns_truncated:
+        caption += f", {display_cols} of {num_columns} columns"
+    # Share the terminal between the data columns instead of dropping any of them:
+    # 8 characters for the outer border and Row column, 4 for the marker column
+    # and 3 per data column for padding and borders
+    fixed_width = 8 + (4 if columns_truncated else 0)
+    cell_width = (console.size.width - fixed_width) // display_cols - 3
+    cell_width = max(1, min(_MAX_PREVIEW_CELL_WIDTH, cell_width))
 
     # Create Rich table
     table = Table(
         title=f"CSV Preview: {file_path.name}",
-        caption=f"Showing {len(rows)} of {total_rows} rows",
+        caption=caption,
         show_header=True,
         header_style="bold cyan",
     )
 
     # Add columns based on whether first row is header
-    table.add_column("Row", style="dim", width=4)
+    table.add_column("Row", style="dim", width=4, no_wrap=True)
 
     if has_header and rows:
         # Use first row as column headers
-        first_row = rows[0]
+        first_row = rows[0][:display_cols]
         for col_idx, header_name in enumerate(first_row):
             col_label = f"{header_name} (Col {col_idx + 1})" if show_column_numbers else header_name
-            table.add_column(col_label, style="green" if col_idx == 0 else "")
+            _add_preview_column(table, col_label, cell_width, style="green" if col_idx == 0 else "")
         # Pad if necessary
-        for col_idx in range(len(first_row), num_columns):
+        for col_idx in range(len(first_row), display_cols):
             col_label = f"Col {col_idx + 1}" if show_column_numbers else f"Column {col_idx + 1}"
-            table.add_column(col_label)
+            _add_preview_column(table, col_label, cell_width)
+        if columns_truncated:
+            table.add_column("…", style="dim", min_width=1)
 
         # Add data rows (skip first row since it's the header)
         for row_idx, row in enumerate(rows[1:], start=2):
-            padded_row = row + [""] * (num_columns - len(row))
-            table.add_row(str(row_idx), *padded_row)
+            table.add_row(str(row_idx), *row[:display_cols], *padding[len(row) :], *marker)
     else:
         # Use generic column numbers
         if show_column_numbers:
-            for col_idx in range(num_columns):
-                table.add_column(f"Col {col_idx + 1}", style="green" if col_idx == 0 else "")
+            for col_idx in range(display_cols):
+                _add_preview_column(
+                    table, f"Col {col_idx + 1}", cell_width, style="green" if col_idx == 0 else ""
+                )
         else:
-            for col_idx in range(num_columns):
-                table.add_column(f"Column {col_idx + 1}")
+            for col_idx in range(display_cols):
+                _add_preview_column(table, f"Column {col_idx + 1}", cell_width)
+        if columns_truncated:
+            table.add_column("…", style="dim", min_width=1)
 
         # Add all rows as data
         for row_idx, row in enumerate(rows, start=1):
-            padded_row = row + [""] * (num_columns - len(row))
-            table.add_row(str(row_idx), *padded_row)
+            table.add_row(str(row_idx), *row[:display_cols], *padding[len(row) :], *marker)
 
     console.print(table)
 
     return has_header
 
 
-def get_column_count(file_path: Path, delimiter: str) -> int:
+def _add_preview_column(table: Table, header: str, max_width: int, style: str = "") -> None:
+    """Add a single-line column whose cells are cut off with an ellipsis when too wide."""
+    from rich.text import Text  # noqa: PLC0415
+
+    # The header may wrap so the column number stays visible in narrow columns
+    table.add_column(
+        Text(header, no_wrap=False, overflow="fold"),
+        style=style,
+        overflow="ellipsis",
+        no_wrap=True,
+        max_width=max_width,
+    )
+
+
+def get_column_count(file_path: Path, delimiter: str, *, info: CsvFileInfo | None = None) -> int:
     """
     Get the number of columns in the CSV file.
 
     Args:
         file_path: Path to CSV file
         delimiter: Field delimiter
+        info: Result of a previous analyze_csv call (re-read the file if None)
 
     Returns:
         Number of columns
     """
-    rows = read_csv_rows(file_path, delimiter, max_rows=5)
-    if not rows:
-        return 0
-    return max(len(row) for row in rows)
+    if info is not None:
+        return info.num_columns
+    _, num_columns = read_csv_rows(file_path, delimiter, max_rows=5)
+    return num_columns
 
 
 def validate_column_index(column_str: str, num_columns: int) -> int | None:
@@ -219,16 +528,13 @@ def validate_column_index(column_str: str, num_columns: int) -> int | None:
     Returns:
         Column index (1-indexed) if valid, None otherwise
     """
-    # Remove $ prefix if present
-    column_str = column_str.strip().lstrip("$")
-
-    try:
-        col_idx = int(column_str)
-        if 1 <= col_idx <= num_columns:
-            return col_idx
-        else:
-            console.print(f"[red]Column {col_idx} is out of range (1-{num_columns})[/red]")
-            return None
-    except ValueError:
-        console.print(f"[red]Invalid column number: {column_str}[/red]")
+    match = _COLUMN_INDEX_RE.fullmatch(column_str)
+    if not match:
+        console.print(f"[red]Invalid column number: {column_str.strip()}[/red]")
         return None
+
+    col_idx = int(match.group(1))
+    if 1 <= col_idx <= num_columns:
+        return col_idx
+    console.print(f"[red]Column {col_idx} is out of range (1-{num_columns})[/red]")
+    return None
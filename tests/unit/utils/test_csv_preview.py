@@ -1,13 +1,17 @@
 """Unit tests for CSV preview utilities."""
 
 import pytest
+from rich.console import Console
 
 from dom.utils.csv_preview import (
+    analyze_csv,
     auto_detect_data_range,
     count_csv_rows,
     detect_header_row,
     get_column_count,
+    preview_csv,
     read_csv_rows,
+    scan_csv,
     validate_column_index,
 )
 
@@ -55,20 +59,21 @@ class TestReadCsvRows:
 
     def test_read_all_rows(self, sample_csv_with_header):
         """Test reading all rows from CSV."""
-        rows = read_csv_rows(sample_csv_with_header, ",")
+        rows, max_cols = read_csv_rows(sample_csv_with_header, ",")
         assert len(rows) == 6  # 1 header + 5 data rows
+        assert max_cols == 4
         assert rows[0] == ["id", "name", "affiliation", "country"]
         assert rows[1] == ["1", "Team Alpha", "University A", "USA"]
 
     def test_read_limited_rows(self, sample_csv_with_header):
         """Test reading limited number of rows."""
-        rows = read_csv_rows(sample_csv_with_header, ",", max_rows=3)
+        rows, _ = read_csv_rows(sample_csv_with_header, ",", max_rows=3)
         assert len(rows) == 3
         assert rows[0] == ["id", "name", "affiliation", "country"]
 
     def test_read_tsv(self, sample_tsv):
         """Test reading TSV file."""
-        rows = read_csv_rows(sample_tsv, "\t")
+        rows, _ = read_csv_rows(sample_tsv, "\t")
         assert len(rows) == 3
         assert rows[0] == ["id", "name", "affiliation", "country"]
 
@@ -76,10 +81,17 @@ class TestReadCsvRows:
         """Test that whitespace is stripped from cells."""
         csv_file = tmp_path / "test.csv"
         csv_file.write_text("  name  ,  org  \n  Team A  ,  Uni A  \n")
-        rows = read_csv_rows(csv_file, ",")
+        rows, _ = read_csv_rows(csv_file, ",")
         assert rows[0] == ["name", "org"]
         assert rows[1] == ["Team A", "Uni A"]
 
+    def test_strips_tabs_and_quoted_padding(self, tmp_path):
+        """Test that leading tabs and whitespace inside quotes are stripped too."""
+        csv_file = tmp_path / "test.csv"
+        csv_file.write_text('"  Team  ",\tUni\n')
+        rows, _ = read_csv_rows(csv_file, ",")
+        assert rows == [["Team", "Uni"]]
+
 
 class TestCountCsvRows:
     """Tests for count_csv_rows function."""
@@ -101,6 +113,77 @@ class TestCountCsvRows:
         count = count_csv_rows(csv_file, ",")
         assert count == 0
 
+    def test_count_large_file_with_pandas(self, tmp_path, monkeypatch):
+        """Test that the pandas path matches the csv module count."""
+        pytest.importorskip("pandas")
+        monkeypatch.setattr("dom.utils.csv_preview._PANDAS_COUNT_THRESHOLD", 0)
+        csv_file = tmp_path / "large.csv"
+        csv_file.write_text('a,b\nc,d,e,f\n\ng\n"multi\nline",2\n')
+        assert count_csv_rows(csv_file, ",", quick=False) == 5
+
+    def test_count_pandas_leading_blank_line(self, tmp_path, monkeypatch):
+        """Test that a leading blank line does not make the pandas path report zero rows."""
+        pytest.importorskip("pandas")
+        monkeypatch.setattr("dom.utils.csv_preview._PANDAS_COUNT_THRESHOLD", 0)
+        csv_file = tmp_path / "large.csv"
+        csv_file.write_text("\nname,org\nA,B\nC,D\n")
+        assert count_csv_rows(csv_file, ",", quick=False) == 4
+
+    def test_count_without_trailing_newline(self, tmp_path):
+        """Test that a final line without newline is counted."""
+        csv_file = tmp_path / "no_newline.csv"
+        csv_file.write_text("a,b\nc,d")
+        assert count_csv_rows(csv_file, ",") == 2
+        assert count_csv_rows(csv_file, ",", quick=True) == 2
+
+    def test_count_in_parallel(self, tmp_path, monkeypatch):
+        """Test that splitting the file across threads gives the same count."""
+        monkeypatch.setattr("dom.utils.csv_preview._PARALLEL_COUNT_THRESHOLD", 1)
+        monkeypatch.setattr("dom.utils.csv_preview._READ_CHUNK_SIZE", 3)
+        monkeypatch.setattr("dom.utils.csv_preview.os.cpu_count", lambda: 4)
+        csv_file = tmp_path / "teams.csv"
+        csv_file.write_text("a,b\nc,d\ne,f\ng,h\ni")
+        assert count_csv_rows(csv_file, ",", quick=True) == 5
+        csv_file.write_text("a,b\nc,d\ne,f\ng,h\n")
+        assert count_csv_rows(csv_file, ",", quick=True) == 4
+
+    def test_count_with_numba(self, tmp_path, monkeypatch):
+        """Test that the compiled scanner agrees with the csv module."""
+        pytest.importorskip("numba")
+        monkeypatch.setattr("dom.utils.csv_preview._NUMBA_SCAN_THRESHOLD", 0)
+        csv_file = tmp_path / "teams.csv"
+        csv_file.write_text('a,b\r\nc,d,e,f\n\ng\n"multi\nline, ""quoted""",2')
+        assert count_csv_rows(csv_file, ",", quick=False) == 5
+        assert scan_csv(csv_file, ",", preview=2) == ([["a", "b"], ["c", "d", "e", "f"]], 5, 4)
+
+    def test_numba_matches_python_with_space_before_quote(self, tmp_path, monkeypatch):
+        """Test that a space before a quote is read the same way by both scanners."""
+        pytest.importorskip("numba")
+        csv_file = tmp_path / "teams.csv"
+        csv_file.write_text("name,org\n" + 'Team A, "Uni, A\nB"\n' * 5)
+        expected = scan_csv(csv_file, ",", preview=2)
+        assert expected[1:] == (11, 3)
+        monkeypatch.setattr("dom.utils.csv_preview._NUMBA_SCAN_THRESHOLD", 0)
+        assert scan_csv(csv_file, ",", preview=2) == expected
+
+    def test_numba_matches_python_with_carriage_returns(self, tmp_path, monkeypatch):
+        """Test that records ending in a lone carriage return are split by both scanners."""
+        pytest.importorskip("numba")
+        csv_file = tmp_path / "teams.csv"
+        csv_file.write_bytes(b"name,org\r" + b"Team,Uni\r" * 5)
+        expected = scan_csv(csv_file, ",", preview=2)
+        assert expected[1:] == (6, 2)
+        monkeypatch.setattr("dom.utils.csv_preview._NUMBA_SCAN_THRESHOLD", 0)
+        assert scan_csv(csv_file, ",", preview=2) == expected
+        assert count_csv_rows(csv_file, ",", quick=False) == 6
+
+    def test_count_quoted_newline(self, tmp_path):
+        """Test that only the line count splits quoted line breaks."""
+        csv_file = tmp_path / "quoted.csv"
+        csv_file.write_text('name,org\n"Team\nA",Uni\n')
+        assert count_csv_rows(csv_file, ",") == 2
+        assert count_csv_rows(csv_file, ",", quick=True) == 3
+
 
 class TestDetectHeaderRow:
     """Tests for detect_header_row function."""
@@ -129,6 +212,16 @@ class TestDetectHeaderRow:
         result = detect_header_row(csv_file, ",")
         assert isinstance(result, bool)
 
+    def test_detect_from_rows(self):
+        """Test detection on already parsed rows."""
+        assert detect_header_row(rows=[["id", "name"], ["1", "Team A"]]) is True
+        assert detect_header_row(rows=[["1", "Alpha"], ["2", "Beta"]]) is False
+
+    def test_detect_compound_header_names(self):
+        """Test that keywords inside snake_case or spaced names are found."""
+        assert detect_header_row(rows=[["team_name", "Org"], ["Alpha", "Uni A"]]) is True
+        assert detect_header_row(rows=[["Team Name", "Org"], ["Alpha", "Uni A"]]) is True
+
 
 class TestAutoDetectDataRange:
     """Tests for auto_detect_data_range function."""
@@ -155,6 +248,14 @@ class TestAutoDetectDataRange:
         assert isinstance(start, int)
         assert isinstance(end, int)
 
+    def test_auto_detect_counts_records(self, tmp_path):
+        """Test that a quoted field spanning lines does not extend the range."""
+        csv_file = tmp_path / "multiline.csv"
+        csv_file.write_text(
+            'name,affiliation\n"Team\nAlpha",University A\nTeam Beta,University B\n'
+        )
+        assert auto_detect_data_range(csv_file, ",") == (2, 3)
+
 
 class TestGetColumnCount:
     """Tests for get_column_count function."""
@@ -179,6 +280,180 @@ class TestGetColumnCount:
         assert count == 0
 
 
+class TestScanCsv:
+    """Tests for scan_csv function."""
+
+    def test_scan_collects_everything(self, sample_csv_with_header):
+        """Test that one scan returns preview rows, row count and column count."""
+        rows, total, cols = scan_csv(sample_csv_with_header, ",", preview=3)
+        assert len(rows) == 3
+        assert rows[1] == ["1", "Team Alpha", "University A", "USA"]
+        assert total == 6
+        assert cols == 4
+
+    def test_scan_empty_file(self, tmp_path):
+        """Test scanning empty file."""
+        csv_file = tmp_path / "empty.csv"
+        csv_file.write_text("")
+        assert scan_csv(csv_file, ",") == ([], 0, 0)
+
+    def test_scan_with_limit(self, sample_csv_with_header):
+        """Test that scanning stops after the row limit."""
+        rows, total, cols = scan_csv(sample_csv_with_header, ",", preview=2, limit=4)
+        assert len(rows) == 2
+        assert total == 4
+        assert cols == 4
+
+
+class TestAnalyzeCsv:
+    """Tests for analyze_csv function."""
+
+    def test_analyze_with_header(self, sample_csv_with_header):
+        """Test analyzing CSV with header row."""
+        info = analyze_csv(sample_csv_with_header, ",")
+        assert info.total_rows == 6
+        assert info.num_columns == 4
+        assert info.header_detected is True
+        assert info.preview_rows[0] == ["id", "name", "affiliation", "country"]
+
+    def test_analyze_limits_preview(self, sample_csv_with_header):
+        """Test that only the requested number of rows is kept in memory."""
+        info = analyze_csv(sample_csv_with_header, ",", max_preview=2)
+        assert len(info.preview_rows) == 2
+        assert info.total_rows == 6
+
+    def test_analyze_marks_truncated_scan(self, sample_csv_with_header):
+        """Test that a scan stopped by its limit is marked as truncated."""
+        info = analyze_csv(sample_csv_with_header, ",", limit=3)
+        assert info.truncated is True
+        assert info.total_rows == 3
+        assert analyze_csv(sample_csv_with_header, ",", limit=100).truncated is False
+        assert analyze_csv(sample_csv_with_header, ",").truncated is False
+
+    def test_analyze_limit_equal_to_row_count(self, sample_csv_with_header):
+        """Test that a file with exactly limit rows is not marked as truncated."""
+        info = analyze_csv(sample_csv_with_header, ",", limit=6)
+        assert info.truncated is False
+        assert info.total_rows == 6
+
+    def test_analyze_ragged_beyond_preview(self, tmp_path):
+        """Test that column count covers rows outside the preview."""
+        csv_file = tmp_path / "ragged.csv"
+        csv_file.write_text("a,b\nc,d\ne,f,g,h\n")
+        info = analyze_csv(csv_file, ",", max_preview=1)
+        assert info.num_columns == 4
+        assert get_column_count(csv_file, ",", info=info) == 4
+
+    def test_analyze_empty_file(self, tmp_path):
+        """Test analyzing empty file."""
+        csv_file = tmp_path / "empty.csv"
+        csv_file.write_text("")
+        info = analyze_csv(csv_file, ",")
+        assert info.preview_rows == []
+        assert info.total_rows == 0
+        assert info.num_columns == 0
+        assert info.header_detected is False
+
+    def test_analyze_is_cached(self, sample_csv_with_header):
+        """Test that analyzing an unchanged file reuses the previous result."""
+        assert analyze_csv(sample_csv_with_header, ",") is analyze_csv(sample_csv_with_header, ",")
+
+    def test_analyze_cache_invalidated_on_change(self, tmp_path):
+        """Test that editing the file produces a fresh result."""
+        csv_file = tmp_path / "teams.csv"
+        csv_file.write_text("a,b\n")
+        assert analyze_csv(csv_file, ",").total_rows == 1
+        csv_file.write_text("a,b\nc,d,e\n")
+        info = analyze_csv(csv_file, ",")
+        assert info.total_rows == 2
+        assert info.num_columns == 3
+
+
+@pytest.fixture
+def preview_console(monkeypatch):
+    """Record preview output on an 80-column console."""
+    recorder = Console(width=80, record=True, force_terminal=False)
+    monkeypatch.setattr("dom.utils.csv_preview.console", recorder)
+    return recorder
+
+
+class TestPreviewCsv:
+    """Tests for preview_csv function."""
+
+    def test_preview_shows_every_column_on_narrow_terminal(self, preview_console, tmp_path):
+        """Test that six columns all fit on an 80-column terminal."""
+        csv_file = tmp_path / "six.csv"
+        csv_file.write_text(
+            "id,name,affiliation,group,email,country\n"
+            "1,Team 1,University 1,3,team1@example.org,USA\n"
+        )
+
+        assert preview_csv(csv_file, ",") is True
+
+        output = preview_console.export_text()
+        assert "(Col 6)" in output
+        assert "USA" in output
+        assert "Showing 2 of 2 rows" in output
+
+    def test_preview_caps_columns(self, preview_console, tmp_path):
+        """Test that wide files are cut to 20 columns with a marker column."""
+        csv_file = tmp_path / "wide.csv"
+        csv_file.write_text("\n".join(",".join("x" * 25) for _ in range(3)) + "\n")
+        preview_console.width = 200
+
+        preview_csv(csv_file, ",", has_header=False)
+
+        output = preview_console.export_text()
+        assert "Col 20" in output
+        assert "Col 21" not in output
+        assert "…" in output
+        assert "Showing 3 of 3 rows, 20 of 25 columns" in output
+
+    def test_preview_caption_without_truncation(self, preview_console, sample_csv_no_header):
+        """Test that the caption omits the column count when nothing is cut."""
+        preview_csv(sample_csv_no_header, ",", has_header=False)
+
+        output = preview_console.export_text()
+        assert "Showing 5 of 5 rows" in output
+        assert "columns" not in output
+
+    def test_preview_caption_uses_given_info(self, preview_console, tmp_path):
+        """Test that the caption comes from the given scan without re-reading the file."""
+        csv_file = tmp_path / "teams.csv"
+        csv_file.write_text("".join(f"{i},Team {i}\n" for i in range(1, 302)))
+        info = analyze_csv(csv_file, ",", limit=1000)
+        csv_file.unlink()
+
+        preview_csv(csv_file, ",", info=info)
+
+        assert "Showing 10 of 301 rows" in preview_console.export_text()
+
+    def test_preview_caption_marks_partial_count(self, preview_console, tmp_path):
+        """Test that the caption shows a lower bound when the scan stops early."""
+        csv_file = tmp_path / "teams.csv"
+        csv_file.write_text("".join(f"{i},Team {i}\n" for i in range(1, 302)))
+
+        preview_csv(csv_file, ",")
+
+        assert "Showing 10 of 100+ rows" in preview_console.export_text()
+
+    def test_preview_empty_file(self, preview_console, tmp_path):
+        """Test previewing an empty file."""
+        csv_file = tmp_path / "empty.csv"
+        csv_file.write_text("")
+
+        assert preview_csv(csv_file, ",") is False
+        assert "empty" in preview_console.export_text()
+
+    def test_preview_blank_lines_only(self, preview_console, tmp_path):
+        """Test previewing a file that contains only blank lines."""
+        csv_file = tmp_path / "blank.csv"
+        csv_file.write_text("\n\n\n")
+
+        assert preview_csv(csv_file, ",") is False
+        assert "empty" in preview_console.export_text()
+
+
 class TestValidateColumnIndex:
     """Tests for validate_column_index function."""
 